@@ -5,22 +5,192 @@ Converts GPX track data to SVG paths with both direct and optimized versions.
 """
 
 import xml.etree.ElementTree as ET
+import contextlib
+import io
 import math
+import os
+import string
 import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from defusedxml.ElementTree import iterparse as safe_iterparse
+except ImportError:
+    safe_iterparse = ET.iterparse
 
 try:
     import elevation
 except ImportError:
-    print("Warning: elevation not installed. Enhanced features disabled.")
     elevation = None
 
-class GPXPoint:
-    def __init__(self, lat: float, lon: float, ele: Optional[float] = None):
-        self.lat = lat
-        self.lon = lon
-        self.ele = ele
+try:
+    import rasterio
+except ImportError:
+    rasterio = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def douglas_peucker_kernel(pts, eps2, keep):
+        """Mark the points Douglas-Peucker keeps, using an explicit index stack."""
+        n = pts.shape[0]
+        stack = np.empty((n, 2), dtype=np.int64)
+        stack[0, 0] = 0
+        stack[0, 1] = n - 1
+        top = 1
+        
+        while top > 0:
+            top -= 1
+            i = stack[top, 0]
+            j = stack[top, 1]
+            
+            x1 = pts[i, 0]
+            y1 = pts[i, 1]
+            dx = pts[j, 0] - x1
+            dy = pts[j, 1] - y1
+            denom = dx * dx + dy * dy
+            
+            # Squared distances scaled by the segment's squared length, so the
+            # threshold absorbs the division once instead of once per point
+            threshold = eps2 * denom if denom != 0 else eps2
+            
+            # Find the interior point with the largest squared distance from the chord
+            max_d2 = -1.0
+            max_index = i + 1
+            for k in range(i + 1, j):
+                px = pts[k, 0] - x1
+                py = pts[k, 1] - y1
+                if denom == 0:
+                    d2 = px * px + py * py
+                else:
+                    num = dy * px - dx * py
+                    d2 = num * num
+                if d2 > max_d2:
+                    max_d2 = d2
+                    max_index = k
+            
+            if max_d2 > threshold:
+                keep[max_index] = True
+                if max_index - i >= 2:
+                    stack[top, 0] = i
+                    stack[top, 1] = max_index
+                    top += 1
+                if j - max_index >= 2:
+                    stack[top, 0] = max_index
+                    stack[top, 1] = j
+                    top += 1
+else:
+    douglas_peucker_kernel = None
+
+# Track points stored as parallel float64 arrays; missing elevation is NaN
+Track = namedtuple('Track', 'lat lon ele')
+
+def empty_track() -> Track:
+    """Create a track with no points."""
+    return Track(np.empty(0), np.empty(0), np.empty(0))
+
+# SVG documents are built from templates parsed once at import time
+SVG_TEMPLATE = string.Template('''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1000 1000" width="1000" height="1000">
+  <title>$filename - $svg_type</title>
+  <desc>GPX track converted to SVG - $svg_type version</desc>
+  <style>
+    .track-path {
+      fill: none;
+      stroke: #FF6B6B;
+      stroke-width: 2;
+      stroke-linecap: round;
+      stroke-linejoin: round;
+    }
+    .track-path-optimized {
+      fill: none;
+      stroke: #4ECDC4;
+      stroke-width: 2;
+      stroke-linecap: round;
+      stroke-linejoin: round;
+    }
+  </style>
+  <path class="$path_class" d="$path_data" />
+</svg>''')
+
+# Gradient for elevation coloring, blue to red
+GRADIENT_STOPS = "".join(
+    f'    <stop offset="{i}%" stop-color="hsl({240 - (i * 1.2)}, 70%, 50%)" />\n'
+    for i in range(0, 101, 20)
+)
+
+ELEVATION_SVG_TEMPLATE = string.Template('''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1000 400" width="1000" height="400">
+  <title>$filename - Elevation Profile</title>
+  <desc>Elevation profile showing height changes along the track</desc>
+  <defs>
+    <linearGradient id="elevationGradient" x1="0%" y1="100%" x2="0%" y2="0%">
+$gradient_stops    </linearGradient>
+  </defs>
+  <style>
+    .elevation-profile {
+      fill: none;
+      stroke: url(#elevationGradient);
+      stroke-width: 3;
+      stroke-linecap: round;
+      stroke-linejoin: round;
+    }
+    .elevation-fill {
+      fill: url(#elevationGradient);
+      fill-opacity: 0.3;
+    }
+    .elevation-grid {
+      stroke: #E0E0E0;
+      stroke-width: 1;
+      stroke-dasharray: 2,2;
+    }
+    .elevation-text {
+      font-family: Arial, sans-serif;
+      font-size: 12px;
+      fill: #666;
+    }
+  </style>
+  
+  <!-- Grid lines -->
+  <g class="elevation-grid">
+    <line x1="0" y1="50" x2="1000" y2="50" />
+    <line x1="0" y1="150" x2="1000" y2="150" />
+    <line x1="0" y1="250" x2="1000" y2="250" />
+  </g>
+  
+  <!-- Elevation area fill -->
+  <path class="elevation-fill" d="$path_data L 1000,300 L 0,300 Z" />
+  
+  <!-- Elevation profile line -->
+  <path class="elevation-profile" d="$path_data" />
+  
+  <!-- Labels -->
+  <text class="elevation-text" x="10" y="25">Max: ${max_ele}m</text>
+  <text class="elevation-text" x="10" y="385">Min: ${min_ele}m</text>
+  
+</svg>''')
+
+def format_path_commands(command: str, coords) -> str:
+    """Format an Nx2 coordinate array as SVG path commands with a single format call."""
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if len(coords) == 0:
+        return ""
+    template = f"{command} %.2f,%.2f " * len(coords)
+    return template[:-1] % tuple(coords.ravel().tolist())
 
 class GPXToSVGConverter:
     def __init__(self, input_dir: str = "input", output_dir: str = "output"):
@@ -33,58 +203,67 @@ class GPXToSVGConverter:
         self.input_dir.mkdir(exist_ok=True)
         self.output_dir.mkdir(exist_ok=True)
     
-    def parse_gpx(self, gpx_file: Path) -> List[GPXPoint]:
+    def iter_track_points(self, source):
+        """Stream (trkpt, ele) element pairs from a GPX file, freeing each one once consumed."""
+        if etree is not None:
+            # '{*}' matches trkpt in any GPX namespace as well as none
+            context = etree.iterparse(source, events=('end',), tag='{*}trkpt', resolve_entities=False, no_network=True)
+            for count, (_, trkpt) in enumerate(context, 1):
+                # Direct child iteration avoids an ElementPath lookup per point
+                yield trkpt, next(trkpt.iterchildren('{*}ele'), None)
+                trkpt.clear()
+                
+                # Drop already-processed siblings in batches to keep memory flat
+                if count % 1024 == 0:
+                    parent = trkpt.getparent()
+                    del parent[:parent.index(trkpt)]
+        else:
+            for _, elem in safe_iterparse(source, events=('end',)):
+                # Strip namespaces on the fly so plain local names match every GPX variant
+                _, _, elem.tag = elem.tag.rpartition('}')
+                if elem.tag == 'trkpt':
+                    yield elem, elem.find('ele')
+                    elem.clear()
+    
+    def parse_gpx(self, gpx_file: Path) -> Track:
         """Parse GPX file and extract track points."""
         try:
-            tree = ET.parse(gpx_file)
-            root = tree.getroot()
-            
-            # Handle different GPX namespaces
-            ns = {'gpx': 'http://www.topografix.com/GPX/1/1'}
-            if root.tag.startswith('{'):
-                ns_uri = root.tag.split('}')[0][1:]
-                ns = {'gpx': ns_uri}
-            
-            points = []
+            lat_l, lon_l, ele_l = [], [], []
             
-            # Find all track points
-            for trkpt in root.findall('.//gpx:trkpt', ns) or root.findall('.//trkpt'):
-                lat = float(trkpt.get('lat'))
-                lon = float(trkpt.get('lon'))
-                
-                # Try to get elevation
-                ele_elem = trkpt.find('gpx:ele', ns)
-                if ele_elem is None:
-                    ele_elem = trkpt.find('ele')
-                ele = float(ele_elem.text) if ele_elem is not None else None
-                
-                points.append(GPXPoint(lat, lon, ele))
+            with open(gpx_file, 'rb') as f:
+                for trkpt, ele_elem in self.iter_track_points(f):
+                    lat_l.append(float(trkpt.get('lat')))
+                    lon_l.append(float(trkpt.get('lon')))
+                    ele_l.append(float(ele_elem.text) if ele_elem is not None else np.nan)
             
-            return points
+            return Track(
+                np.array(lat_l, dtype=np.float64),
+                np.array(lon_l, dtype=np.float64),
+                np.array(ele_l, dtype=np.float64),
+            )
         
         except Exception as e:
             print(f"Error parsing GPX file {gpx_file}: {e}")
-            return []
+            return empty_track()
     
-    def enhance_elevation_data(self, points: List[GPXPoint]) -> List[GPXPoint]:
+    def enhance_elevation_data(self, track: Track) -> Track:
         """Enhance GPX points with SRTM elevation data where missing."""
-        if not elevation or not points:
-            return points
+        if not elevation or track.lat.size == 0:
+            return track
         
         # Check if we need elevation enhancement
-        missing_elevation = [p for p in points if p.ele is None]
-        if not missing_elevation:
-            print(f"All {len(points)} points already have elevation data")
-            return points
+        missing = np.isnan(track.ele)
+        missing_count = int(np.count_nonzero(missing))
+        if not missing_count:
+            print(f"All {track.lat.size} points already have elevation data")
+            return track
         
-        print(f"Enhancing elevation for {len(missing_elevation)} points using SRTM data...")
+        print(f"Enhancing elevation for {missing_count} points using SRTM data...")
         
         try:
             # Create bounds for elevation data download
-            lats = [p.lat for p in points]
-            lons = [p.lon for p in points]
-            min_lat, max_lat = min(lats), max(lats)
-            min_lon, max_lon = min(lons), max(lons)
+            min_lat, max_lat = float(track.lat.min()), float(track.lat.max())
+            min_lon, max_lon = float(track.lon.min()), float(track.lon.max())
             
             # Add small buffer
             buffer = 0.01
@@ -95,64 +274,58 @@ class GPXToSVGConverter:
                 dem_path = Path(temp_dir) / 'elevation.tif'
                 elevation.clip(bounds=bounds, output=str(dem_path), product='SRTM1')
                 
-                # Use elevation library to get elevation for missing points
-                enhanced_points = []
-                for point in points:
-                    if point.ele is None:
+                ele = track.ele.copy()
+                
+                if rasterio is not None:
+                    # Sample all missing points from the downloaded DEM in one batch
+                    with rasterio.open(dem_path) as src:
+                        coords = list(zip(track.lon[missing].tolist(), track.lat[missing].tolist()))
+                        values = np.array(list(src.sample(coords, indexes=1)), dtype=np.float64)[:, 0]
+                        if src.nodata is not None:
+                            values[values == src.nodata] = np.nan
+                    
+                    ele[missing] = values
+                else:
+                    # Use elevation library to get elevation for missing points
+                    for idx in np.nonzero(missing)[0]:
+                        lat, lon = float(track.lat[idx]), float(track.lon[idx])
                         try:
                             # Get elevation from SRTM data
-                            result = elevation.elevation([point.lon], [point.lat])
+                            result = elevation.elevation([lon], [lat])
                             if result and len(result) > 0 and result[0] is not None:
-                                point.ele = float(result[0])
+                                ele[idx] = float(result[0])
                         except Exception as e:
-                            print(f"Warning: Could not get elevation for point ({point.lat}, {point.lon}): {e}")
-                    enhanced_points.append(point)
+                            print(f"Warning: Could not get elevation for point ({lat}, {lon}): {e}")
                 
-                enhanced_count = sum(1 for p in enhanced_points if p.ele is not None) - sum(1 for p in points if p.ele is not None)
+                enhanced_count = missing_count - int(np.count_nonzero(np.isnan(ele)))
                 print(f"Successfully enhanced {enhanced_count} elevation points")
-                return enhanced_points
+                return track._replace(ele=ele)
                 
         except Exception as e:
             print(f"Error enhancing elevation data: {e}")
-            return points
+            return track
     
-    def lat_lon_to_xy(self, points: List[GPXPoint]) -> List[Tuple[float, float]]:
-        """Convert lat/lon coordinates to X/Y coordinates for SVG with proper aspect ratio."""
-        if not points:
-            return []
-        
-        # Find bounds
-        min_lat = min(p.lat for p in points)
-        max_lat = max(p.lat for p in points)
-        min_lon = min(p.lon for p in points)
-        max_lon = max(p.lon for p in points)
-        
-        # Convert to Web Mercator projection coordinates (in meters)
-        def lat_to_mercator_y(lat):
-            return math.log(math.tan(math.radians(lat) / 2 + math.pi / 4))
-        
-        def lon_to_mercator_x(lon):
-            return math.radians(lon)
-        
-        # Convert all points to Mercator coordinates
-        mercator_points = []
-        for point in points:
-            x_merc = lon_to_mercator_x(point.lon)
-            y_merc = lat_to_mercator_y(point.lat)
-            mercator_points.append((x_merc, y_merc))
+    def lat_lon_to_xy(self, track: Track) -> np.ndarray:
+        """Convert lat/lon coordinates to an Nx2 array of SVG X/Y coordinates with proper aspect ratio."""
+        if track.lat.size == 0:
+            return np.empty((0, 2))
+        
+        # Convert all points to Web Mercator projection coordinates
+        x_merc = np.deg2rad(track.lon)
+        y_merc = np.log(np.tan(np.deg2rad(track.lat) / 2 + np.pi / 4))
         
         # Find mercator bounds
-        min_x_merc = min(p[0] for p in mercator_points)
-        max_x_merc = max(p[0] for p in mercator_points)
-        min_y_merc = min(p[1] for p in mercator_points)
-        max_y_merc = max(p[1] for p in mercator_points)
+        min_x_merc = float(x_merc.min())
+        max_x_merc = float(x_merc.max())
+        min_y_merc = float(y_merc.min())
+        max_y_merc = float(y_merc.max())
         
         x_range = max_x_merc - min_x_merc
         y_range = max_y_merc - min_y_merc
         
         # Determine which dimension to use for scaling to maintain aspect ratio
         if x_range == 0 and y_range == 0:
-            return [(500, 500)] * len(points)
+            return np.full((track.lat.size, 2), 500.0)
         elif x_range == 0:
             scale = 800 / y_range
             x_offset = 500
@@ -168,270 +341,235 @@ class GPXToSVGConverter:
             y_offset = (1000 - (y_range * scale)) / 2
         
         # Convert to SVG coordinates
-        xy_points = []
-        for x_merc, y_merc in mercator_points:
-            x = ((x_merc - min_x_merc) * scale) + x_offset
-            y = ((max_y_merc - y_merc) * scale) + y_offset  # Flip Y axis for SVG
-            xy_points.append((x, y))
+        x = ((x_merc - min_x_merc) * scale) + x_offset
+        y = ((max_y_merc - y_merc) * scale) + y_offset  # Flip Y axis for SVG
+        
+        return np.column_stack([x, y])
+    
+    def remove_duplicate_points(self, points: np.ndarray) -> np.ndarray:
+        """Drop consecutive points that land on the same SVG coordinate (e.g. while stopped)."""
+        if len(points) <= 1:
+            return points
         
-        return xy_points
+        # Compare at the 2-decimal precision used in the SVG output
+        rounded = np.round(points, 2)
+        changed = np.any(rounded[1:] != rounded[:-1], axis=1)
+        return np.vstack([points[:1], points[1:][changed]])
     
-    def create_direct_svg_path(self, points: List[Tuple[float, float]]) -> str:
+    def create_direct_svg_path(self, points: np.ndarray) -> str:
         """Create a direct SVG path (one-to-one conversion)."""
-        if not points:
+        if len(points) == 0:
             return ""
         
-        path_data = f"M {points[0][0]:.2f},{points[0][1]:.2f}"
-        for x, y in points[1:]:
-            path_data += f" L {x:.2f},{y:.2f}"
+        path_data = format_path_commands("M", points[:1])
+        if len(points) > 1:
+            path_data += " " + format_path_commands("L", points[1:])
         
         return path_data
     
-    def douglas_peucker(self, points: List[Tuple[float, float]], epsilon: float = 2.0) -> List[Tuple[float, float]]:
+    def douglas_peucker(self, points: np.ndarray, epsilon: float = 2.0) -> np.ndarray:
         """Simplify path using Douglas-Peucker algorithm."""
-        if len(points) <= 2:
-            return points
-        
-        # Find the point with maximum distance from line between first and last points
-        max_dist = 0
-        max_index = 0
-        start = points[0]
-        end = points[-1]
-        
-        for i in range(1, len(points) - 1):
-            dist = self.perpendicular_distance(points[i], start, end)
-            if dist > max_dist:
-                max_dist = dist
-                max_index = i
-        
-        # If max distance is greater than epsilon, recursively simplify
-        if max_dist > epsilon:
-            # Recursive call on both halves
-            left_results = self.douglas_peucker(points[:max_index + 1], epsilon)
-            right_results = self.douglas_peucker(points[max_index:], epsilon)
+        pts = np.ascontiguousarray(points, dtype=np.float64)
+        n = len(pts)
+        if n <= 2:
+            return pts
+        
+        # Compare squared distances against squared epsilon to avoid sqrt per point
+        eps2 = epsilon * epsilon
+        keep = np.zeros(n, dtype=bool)
+        keep[0] = keep[-1] = True
+        
+        # Use the compiled kernel when numba is available
+        if douglas_peucker_kernel is not None:
+            douglas_peucker_kernel(pts, eps2, keep)
+            return pts[keep]
+        
+        # Explicit stack of (start, end) index ranges instead of recursion
+        stack = [(0, n - 1)]
+        while stack:
+            i, j = stack.pop()
+            if j - i < 2:
+                continue
             
-            # Merge results (remove duplicate middle point)
-            return left_results[:-1] + right_results
-        else:
-            return [start, end]
+            x1, y1 = pts[i]
+            dx, dy = pts[j] - pts[i]
+            interior = pts[i + 1:j]
+            denom = dx * dx + dy * dy
+            
+            # Squared distance of every interior point from the line between start and end,
+            # scaled by the segment's squared length so the division moves onto the threshold
+            if denom == 0:
+                d2 = (interior[:, 0] - x1) ** 2 + (interior[:, 1] - y1) ** 2
+                threshold = eps2
+            else:
+                num = dy * (interior[:, 0] - x1) - dx * (interior[:, 1] - y1)
+                d2 = num * num
+                threshold = eps2 * denom
+            
+            offset = int(np.argmax(d2))
+            if d2[offset] > threshold:
+                k = i + 1 + offset
+                keep[k] = True
+                stack.append((i, k))
+                stack.append((k, j))
+        
+        return pts[keep]
     
     def perpendicular_distance(self, point: Tuple[float, float], line_start: Tuple[float, float], line_end: Tuple[float, float]) -> float:
-        """Calculate perpendicular distance from point to line."""
-        x0, y0 = point
-        x1, y1 = line_start
-        x2, y2 = line_end
+        """Calculate perpendicular distance from point to line.
+        
+        Douglas-Peucker inlines a squared form of this; it remains for callers needing the true distance.
+        """
+        # Scalar path: use math.* here, numpy functions carry heavy per-call overhead on scalars
+        x0, y0 = float(point[0]), float(point[1])
+        x1, y1 = float(line_start[0]), float(line_start[1])
+        x2, y2 = float(line_end[0]), float(line_end[1])
         
         # If line start and end are the same point
         if x1 == x2 and y1 == y2:
-            return math.sqrt((x0 - x1) ** 2 + (y0 - y1) ** 2)
+            return math.hypot(x0 - x1, y0 - y1)
         
         # Calculate perpendicular distance using formula
         numerator = abs((y2 - y1) * x0 - (x2 - x1) * y0 + x2 * y1 - y2 * x1)
-        denominator = math.sqrt((y2 - y1) ** 2 + (x2 - x1) ** 2)
+        denominator = math.hypot(y2 - y1, x2 - x1)
         
         return numerator / denominator
     
-    def create_optimized_svg_path(self, points: List[Tuple[float, float]]) -> str:
-        """Create an optimized SVG path using Douglas-Peucker simplification."""
-        if not points:
-            return ""
+    def create_optimized_svg_path(self, points: np.ndarray) -> Tuple[str, int]:
+        """Create an optimized SVG path using Douglas-Peucker simplification.
+        
+        Returns the path data together with the number of simplified points.
+        """
+        if len(points) == 0:
+            return "", 0
         
         # Simplify the path
         simplified_points = self.douglas_peucker(points, epsilon=2.0)
         
-        if not simplified_points:
-            return ""
+        if len(simplified_points) == 0:
+            return "", 0
         
         # Create smooth curves using quadratic Bezier curves
-        path_data = f"M {simplified_points[0][0]:.2f},{simplified_points[0][1]:.2f}"
+        parts = [format_path_commands("M", simplified_points[:1])]
         
         if len(simplified_points) == 2:
-            path_data += f" L {simplified_points[1][0]:.2f},{simplified_points[1][1]:.2f}"
+            parts.append(format_path_commands("L", simplified_points[1:]))
         elif len(simplified_points) > 2:
-            # Create smooth curves
-            for i in range(1, len(simplified_points) - 1):
-                curr_point = simplified_points[i]
-                next_point = simplified_points[i + 1]
-                
-                # Control point for smooth curve
-                if i == 1:
-                    path_data += f" Q {curr_point[0]:.2f},{curr_point[1]:.2f} {(curr_point[0] + next_point[0])/2:.2f},{(curr_point[1] + next_point[1])/2:.2f}"
-                else:
-                    path_data += f" T {(curr_point[0] + next_point[0])/2:.2f},{(curr_point[1] + next_point[1])/2:.2f}"
+            # Curves pass through the midpoints between consecutive simplified points
+            midpoints = (simplified_points[1:-1] + simplified_points[2:]) / 2
+            
+            # The first point is the control point of the initial curve
+            parts.append("Q %.2f,%.2f %.2f,%.2f" % (*simplified_points[1], *midpoints[0]))
+            if len(midpoints) > 1:
+                parts.append(format_path_commands("T", midpoints[1:]))
             
             # Add final point
-            path_data += f" T {simplified_points[-1][0]:.2f},{simplified_points[-1][1]:.2f}"
+            parts.append(format_path_commands("T", simplified_points[-1:]))
         
-        return path_data
+        path_data = " ".join(parts)
+        
+        return path_data, len(simplified_points)
     
     def create_svg(self, path_data: str, filename: str, is_optimized: bool = False) -> str:
         """Create complete SVG file content."""
         svg_type = "optimized" if is_optimized else "direct"
         
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1000 1000" width="1000" height="1000">
-  <title>{filename} - {svg_type}</title>
-  <desc>GPX track converted to SVG - {svg_type} version</desc>
-  <style>
-    .track-path {{
-      fill: none;
-      stroke: #FF6B6B;
-      stroke-width: 2;
-      stroke-linecap: round;
-      stroke-linejoin: round;
-    }}
-    .track-path-optimized {{
-      fill: none;
-      stroke: #4ECDC4;
-      stroke-width: 2;
-      stroke-linecap: round;
-      stroke-linejoin: round;
-    }}
-  </style>
-  <path class="{'track-path-optimized' if is_optimized else 'track-path'}" d="{path_data}" />
-</svg>'''
-        return svg_content
+        return SVG_TEMPLATE.substitute(
+            filename=filename,
+            svg_type=svg_type,
+            path_class='track-path-optimized' if is_optimized else 'track-path',
+            path_data=path_data,
+        )
     
-    def create_elevation_profile_svg(self, points: List[GPXPoint], filename: str) -> str:
+    def create_elevation_profile_svg(self, track: Track, filename: str) -> str:
         """Create elevation profile SVG showing height changes along the track."""
-        if not points or not any(p.ele for p in points):
-            return ""
-        
         # Filter points with elevation data
-        elevation_points = [(i, p.ele) for i, p in enumerate(points) if p.ele is not None]
-        if not elevation_points:
+        has_elevation = ~np.isnan(track.ele)
+        if not has_elevation.any():
             return ""
         
+        indices = np.nonzero(has_elevation)[0]
+        elevations = track.ele[has_elevation]
+        
         # Calculate dimensions
-        min_ele = min(ele for _, ele in elevation_points)
-        max_ele = max(ele for _, ele in elevation_points)
+        min_ele = float(elevations.min())
+        max_ele = float(elevations.max())
         ele_range = max_ele - min_ele or 1
         
         # Create path data for elevation profile
         width, height = 1000, 300
-        path_data = ""
-        
-        for i, (idx, ele) in enumerate(elevation_points):
-            x = (idx / (len(points) - 1)) * width
-            y = height - ((ele - min_ele) / ele_range) * height
-            
-            if i == 0:
-                path_data += f"M {x:.2f},{y:.2f}"
-            else:
-                path_data += f" L {x:.2f},{y:.2f}"
-        
-        # Create gradient for elevation coloring
-        gradient_stops = ""
-        for i in range(0, 101, 20):
-            hue = 240 - (i * 1.2)  # Blue to red
-            gradient_stops += f'    <stop offset="{i}%" stop-color="hsl({hue}, 70%, 50%)" />\n'
-        
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1000 400" width="1000" height="400">
-  <title>{filename} - Elevation Profile</title>
-  <desc>Elevation profile showing height changes along the track</desc>
-  <defs>
-    <linearGradient id="elevationGradient" x1="0%" y1="100%" x2="0%" y2="0%">
-{gradient_stops}    </linearGradient>
-  </defs>
-  <style>
-    .elevation-profile {{
-      fill: none;
-      stroke: url(#elevationGradient);
-      stroke-width: 3;
-      stroke-linecap: round;
-      stroke-linejoin: round;
-    }}
-    .elevation-fill {{
-      fill: url(#elevationGradient);
-      fill-opacity: 0.3;
-    }}
-    .elevation-grid {{
-      stroke: #E0E0E0;
-      stroke-width: 1;
-      stroke-dasharray: 2,2;
-    }}
-    .elevation-text {{
-      font-family: Arial, sans-serif;
-      font-size: 12px;
-      fill: #666;
-    }}
-  </style>
-  
-  <!-- Grid lines -->
-  <g class="elevation-grid">
-    <line x1="0" y1="50" x2="1000" y2="50" />
-    <line x1="0" y1="150" x2="1000" y2="150" />
-    <line x1="0" y1="250" x2="1000" y2="250" />
-  </g>
-  
-  <!-- Elevation area fill -->
-  <path class="elevation-fill" d="{path_data} L 1000,300 L 0,300 Z" />
-  
-  <!-- Elevation profile line -->
-  <path class="elevation-profile" d="{path_data}" />
-  
-  <!-- Labels -->
-  <text class="elevation-text" x="10" y="25">Max: {max_ele:.0f}m</text>
-  <text class="elevation-text" x="10" y="385">Min: {min_ele:.0f}m</text>
-  
-</svg>'''
-        return svg_content
+        x = (indices / max(track.ele.size - 1, 1)) * width
+        y = height - ((elevations - min_ele) / ele_range) * height
+        path_data = self.create_direct_svg_path(np.column_stack([x, y]))
+        
+        return ELEVATION_SVG_TEMPLATE.substitute(
+            filename=filename,
+            gradient_stops=GRADIENT_STOPS,
+            path_data=path_data,
+            max_ele=f"{max_ele:.0f}",
+            min_ele=f"{min_ele:.0f}",
+        )
     
     def convert_file(self, gpx_file: Path):
         """Convert a single GPX file to SVG formats."""
         print(f"Converting {gpx_file.name}...")
         
         # Parse GPX file
-        points = self.parse_gpx(gpx_file)
-        if not points:
+        track = self.parse_gpx(gpx_file)
+        if track.lat.size == 0:
             print(f"No track points found in {gpx_file.name}")
             return
         
-        print(f"Found {len(points)} track points")
+        print(f"Found {track.lat.size} track points")
         
         # Enhance elevation data if available
-        enhanced_points = self.enhance_elevation_data(points)
+        enhanced_track = self.enhance_elevation_data(track)
         
         # Convert to XY coordinates
-        xy_points = self.lat_lon_to_xy(enhanced_points)
+        xy_points = self.remove_duplicate_points(self.lat_lon_to_xy(enhanced_track))
+        duplicate_count = track.lat.size - len(xy_points)
+        if duplicate_count:
+            print(f"Removed {duplicate_count} duplicate consecutive points")
         
         # Create output directory for this GPX file
         base_name = gpx_file.stem
         file_output_dir = self.output_dir / base_name
         file_output_dir.mkdir(exist_ok=True)
+        produced = []
         
         # Create direct conversion SVG
         direct_path = self.create_direct_svg_path(xy_points)
         if direct_path:
             direct_svg = self.create_svg(direct_path, base_name, is_optimized=False)
             direct_file = file_output_dir / f"{base_name}_direct.svg"
-            direct_file.write_text(direct_svg, encoding='utf-8')
+            direct_file.write_bytes(direct_svg.encode('utf-8'))
+            produced.append(direct_file)
             print(f"Created direct SVG: {direct_file}")
         
         # Create optimized SVG
-        optimized_path = self.create_optimized_svg_path(xy_points)
+        optimized_path, simplified_points = self.create_optimized_svg_path(xy_points)
         if optimized_path:
             optimized_svg = self.create_svg(optimized_path, base_name, is_optimized=True)
             optimized_file = file_output_dir / f"{base_name}_optimized.svg"
-            optimized_file.write_text(optimized_svg, encoding='utf-8')
+            optimized_file.write_bytes(optimized_svg.encode('utf-8'))
+            produced.append(optimized_file)
             print(f"Created optimized SVG: {optimized_file}")
             
             # Calculate compression ratio
             original_points = len(xy_points)
-            simplified_points = len(self.douglas_peucker(xy_points, epsilon=2.0))
             compression_ratio = (1 - simplified_points / original_points) * 100
             print(f"Optimization: {original_points} → {simplified_points} points ({compression_ratio:.1f}% reduction)")
         
         # Create elevation profile SVG if elevation data is available
-        if any(p.ele is not None for p in enhanced_points):
-            elevation_svg = self.create_elevation_profile_svg(enhanced_points, base_name)
+        if np.any(~np.isnan(enhanced_track.ele)):
+            elevation_svg = self.create_elevation_profile_svg(enhanced_track, base_name)
             if elevation_svg:
                 elevation_file = file_output_dir / f"{base_name}_elevation.svg"
-                elevation_file.write_text(elevation_svg, encoding='utf-8')
+                elevation_file.write_bytes(elevation_svg.encode('utf-8'))
+                produced.append(elevation_file)
                 print(f"Created elevation profile SVG: {elevation_file}")
         
-        print(f"Total output files: {len(list(file_output_dir.glob('*.svg')))}")
+        print(f"Total output files: {len(produced)}")
     
     def process_all_files(self):
         """Process all GPX files in the input directory."""
@@ -444,19 +582,48 @@ class GPXToSVGConverter:
         
         print(f"Found {len(gpx_files)} GPX file(s)")
         
-        for gpx_file in gpx_files:
+        # A single file gains nothing from a worker pool, and converting in-process streams its log
+        if len(gpx_files) == 1:
+            gpx_file = gpx_files[0]
             try:
                 self.convert_file(gpx_file)
                 print()
             except Exception as e:
                 print(f"Error converting {gpx_file.name}: {e}")
                 print()
+            return
+        
+        # Files are independent, so convert them in parallel and report in input order
+        max_workers = min(len(gpx_files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(gpx_file, executor.submit(convert_gpx_file, self, gpx_file)) for gpx_file in gpx_files]
+            
+            for gpx_file, future in futures:
+                try:
+                    print(future.result())
+                except Exception as e:
+                    # The worker itself failed (e.g. it crashed), so no log output came back
+                    print(f"Error converting {gpx_file.name}: {e}")
+                    print()
+
+def convert_gpx_file(converter: GPXToSVGConverter, gpx_file: Path) -> str:
+    """Convert a single GPX file in a worker process and return its log output, including any error."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            converter.convert_file(gpx_file)
+        except Exception as e:
+            print(f"Error converting {gpx_file.name}: {e}")
+    return output.getvalue()
 
 def main():
     """Main function to run the converter."""
     print("GPX to SVG Converter")
     print("===================")
     
+    if elevation is None:
+        print("Warning: elevation not installed. Enhanced features disabled.")
+    
     # Create converter instance
     converter = GPXToSVGConverter()
     